@@ -32,14 +32,51 @@ Next, initialize your extension:
 Serializers
 -----------
 Let's create 2 serializers that will return our answer to the correct format.
-For instance, our server will be able to either answer in JSON or in XML:
-
-    >>> import xmltodict
-    >>> from flask import jsonify, make_response
+For instance, our server will be able to either answer in JSON or in XML.
+The JSON serializer uses `orjson <https://github.com/ijl/orjson>`_, whose
+``dumps`` returns ``bytes`` that can be handed to the response as they are,
+while the XML one builds the document with
+`lxml <https://lxml.de/>`_ and serializes it in a single call:
+
+    >>> import orjson
+    >>> from flask import Response, make_response
+    >>> from lxml import etree
     >>> def json_v1_search(search_result):
-    ...     return make_response(jsonify(search_result))
+    ...     return Response(
+    ...         orjson.dumps(search_result), mimetype='application/json')
+    >>> def dict_to_etree(parent, value):
+    ...     if isinstance(value, dict):
+    ...         for key, item in value.items():
+    ...             for child in item if isinstance(item, list) else [item]:
+    ...                 dict_to_etree(etree.SubElement(parent, key), child)
+    ...     else:
+    ...         parent.text = str(value)
     >>> def xml_v1_search(search_result):
-    ...     return make_response(xmltodict.unparse((search_result,)))
+    ...     root = etree.Element('root')
+    ...     dict_to_etree(root, search_result)
+    ...     return make_response(
+    ...         etree.tostring(root, xml_declaration=True, encoding='utf-8'),
+    ...         {'Content-Type': 'application/xml'})
+
+.. note::
+
+   orjson emits strict RFC 8259 JSON and does not escape ``<``, ``>`` or
+   ``&``. This is fine for API responses, but the output must be escaped
+   again before being embedded in an HTML ``<script>`` tag.
+
+For large lists of records, a serializer can also stream the response instead
+of building the whole body in memory, so that the client starts receiving
+bytes before the serialization is over:
+
+    >>> from flask import stream_with_context
+    >>> def json_v1_search_stream(hits):
+    ...     def generate():
+    ...         yield b'['
+    ...         for index, hit in enumerate(hits):
+    ...             yield (b',' if index else b'') + orjson.dumps(hit)
+    ...         yield b']'
+    ...     return Response(
+    ...         stream_with_context(generate()), mimetype='application/json')
 
 Views
 -----
@@ -47,21 +84,27 @@ Now we create our view that will handle the requests and return the serialized
 response based on the request's headers or using the default media type.
 To do so, we need to create a class that inherits
 :class:`~.views.ContentNegotiatedMethodView`. In the constructor, we register
-our two serializers, and we create a `get` method for the `GET` requests:
+our two serializers, and we create a `get` method for the `GET` requests.
+The view does not keep any per-request state, so we let Flask create it only
+once with ``init_every_request`` and keep the serializer mappings as class
+attributes instead of rebuilding them in the constructor:
 
     >>> from invenio_rest import ContentNegotiatedMethodView
     >>> class RecordsListResource(ContentNegotiatedMethodView):
+    ...     init_every_request = False
+    ...     _METHOD_SERIALIZERS = {
+    ...         'GET': {
+    ...             'application/json': json_v1_search,
+    ...             'application/xml': xml_v1_search,
+    ...         },
+    ...     }
+    ...     _DEFAULT_METHOD_MEDIA_TYPE = {
+    ...         'GET': 'application/json',
+    ...     }
     ...     def __init__(self, **kwargs):
     ...         super(RecordsListResource, self).__init__(
-    ...             method_serializers={
-    ...                 'GET': {
-    ...                     'application/json': json_v1_search,
-    ...                     'application/xml': xml_v1_search,
-    ...                 },
-    ...             },
-    ...             default_method_media_type={
-    ...                 'GET': 'application/json',
-    ...             },
+    ...             method_serializers=self._METHOD_SERIALIZERS,
+    ...             default_method_media_type=self._DEFAULT_METHOD_MEDIA_TYPE,
     ...             default_media_type='application/json',
     ...             **kwargs)
     ...     def get(self, **kwargs):
@@ -190,12 +233,23 @@ responsible for providing API authentication based on OAuth 2.0 as well as
 protecting against CRSF-attacks in the REST API.
 """
 
-from __future__ import absolute_import, print_function
-
+# ``csrf`` is imported eagerly because it shares its name with the
+# ``invenio_rest.csrf`` module, which would otherwise shadow it.
 from .csrf import csrf
-from .ext import InvenioREST
-from .views import ContentNegotiatedMethodView
 
 __version__ = "2.0.0"
 
 __all__ = ("__version__", "csrf", "InvenioREST", "ContentNegotiatedMethodView")
+
+
+def __getattr__(name):
+    """Lazily import the extension and the view class."""
+    if name == "InvenioREST":
+        from .ext import InvenioREST
+
+        return InvenioREST
+    if name == "ContentNegotiatedMethodView":
+        from .views import ContentNegotiatedMethodView
+
+        return ContentNegotiatedMethodView
+    raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
@@ -13,8 +13,6 @@ Please also see
 configuration options.
 """
 
-from __future__ import unicode_literals
-
 CORS_RESOURCES = "*"
 """Dictionary for configuring CORS for endpoints.
 
@@ -35,14 +33,14 @@ CORS_SEND_WILDCARD = True
    configuration.
 """
 
-CORS_EXPOSE_HEADERS = [
+CORS_EXPOSE_HEADERS = (
     "ETag",
     "Link",
     "X-RateLimit-Limit",
     "X-RateLimit-Remaining",
     "X-RateLimit-Reset",
     "Content-Type",
-]
+)
 """Expose the following headers.
 
 .. note:: Overwrites
@@ -76,6 +74,41 @@ REST_MIMETYPE_QUERY_ARG_NAME = None
        }
 """
 
+REST_NEGOTIATION_CACHE_SIZE = 512
+"""Number of ``Accept`` headers for which the negotiated media type is cached.
+
+   Content negotiation only depends on the ``Accept`` header and on the media
+   types supported by the view, so the result is kept in a LRU cache of this
+   size. Set it to ``0`` to disable the cache.
+"""
+
+REST_JSON_SERIALIZER = None
+"""JSON library used by the application's JSON provider.
+
+   By default Flask's provider, based on the standard library :mod:`json`
+   module, is used. Set it to ``'orjson'`` to install
+   :class:`~invenio_rest.serializer.OrjsonProvider`, which requires the
+   ``orjson`` package (``pip install invenio-rest[orjson]``).
+"""
+
+REST_RESPONSE_COMPRESS = False
+"""Compress responses with gzip when the client accepts it.
+
+   Only responses whose mimetype is listed in
+   :data:`REST_RESPONSE_COMPRESS_MIMETYPES` and whose body is at least
+   :data:`REST_RESPONSE_COMPRESS_MIN_SIZE` bytes are compressed. Streamed
+   responses are never compressed.
+"""
+
+REST_RESPONSE_COMPRESS_MIMETYPES = ("application/json", "application/xml")
+"""Mimetypes of the responses which are compressed."""
+
+REST_RESPONSE_COMPRESS_MIN_SIZE = 500
+"""Minimum size in bytes of the responses which are compressed."""
+
+REST_RESPONSE_COMPRESS_LEVEL = 1
+"""Gzip compression level, from ``1`` (fastest) to ``9`` (smallest)."""
+
 REST_CSRF_ENABLED = False
 """Enable CSRF middleware. (Default: ``False``).
 
@@ -16,10 +16,12 @@ about CSRF protection. For more information you can see here:
 """
 
 
+import hmac
 import secrets
 import string
 from datetime import datetime, timedelta, timezone
-from urllib.parse import urlparse
+from functools import lru_cache
+from urllib.parse import urlsplit
 
 from flask import Blueprint, abort, current_app, request
 from invenio_base.jws import TimedJSONWebSignatureSerializer
@@ -43,18 +45,61 @@ def _get_csrf_serializer(expires_in=None):
     generated must be signed so as to avoid any client-side tampering.
     """
     expires_in = expires_in or current_app.config["CSRF_TOKEN_EXPIRES_IN"]
+    secret = current_app.config.get(
+        "CSRF_SECRET", current_app.config.get("SECRET_KEY") or "CHANGE_ME"
+    )
+    # A list of secrets can be given for key rotation, it must be hashable
+    # to be part of the cache key.
+    if isinstance(secret, list):
+        secret = tuple(secret)
 
-    return TimedJSONWebSignatureSerializer(
-        current_app.config.get(
-            "CSRF_SECRET", current_app.config.get("SECRET_KEY") or "CHANGE_ME"
-        ),
-        salt=current_app.config["CSRF_SECRET_SALT"],
-        expires_in=expires_in,
+    return _create_csrf_serializer(
+        secret, current_app.config["CSRF_SECRET_SALT"], expires_in
     )
 
 
+@lru_cache(maxsize=32)
+def _create_csrf_serializer(secret, salt, expires_in):
+    """Create the CSRF serializer.
+
+    Serializers are stateless, so they are cached and shared between requests
+    using the same configuration.
+    """
+    return TimedJSONWebSignatureSerializer(secret, salt=salt, expires_in=expires_in)
+
+
+@lru_cache(maxsize=8)
+def _get_translation_tables(allowed_chars):
+    """Return the tables mapping random bytes to ``allowed_chars``.
+
+    The first table translates each byte to an allowed character, the second
+    one lists the bytes to discard so that every character is equally likely.
+    Returns ``None`` if the characters cannot be mapped from single bytes.
+    """
+    try:
+        alphabet = allowed_chars.encode("ascii")
+    except UnicodeEncodeError:
+        return None
+    size = len(alphabet)
+    if not 0 < size <= 256:
+        return None
+    limit = 256 - 256 % size
+    return bytes(alphabet[b % size] for b in range(256)), bytes(range(limit, 256))
+
+
 def _get_random_string(length, allowed_chars):
-    return "".join(secrets.choice(allowed_chars) for i in range(length))
+    """Return a random string of ``length`` characters from ``allowed_chars``.
+
+    Random bytes are drawn in bulk and translated to the allowed characters.
+    """
+    tables = _get_translation_tables(allowed_chars)
+    if tables is None:
+        return "".join(secrets.choice(allowed_chars) for i in range(length))
+    table, rejected = tables
+    value = b""
+    while len(value) < length:
+        value += secrets.token_bytes(2 * length).translate(table, rejected)
+    return value[:length].decode("ascii")
 
 
 def _get_new_csrf_token(expires_in=None):
@@ -65,7 +110,8 @@ def _get_new_csrf_token(expires_in=None):
             current_app.config["CSRF_ALLOWED_CHARS"],
         )
     )
-    return encoded_token.decode("utf-8")
+    # JWS tokens only contain base64url characters and dots.
+    return encoded_token.decode("ascii")
 
 
 def _get_csrf_token():
@@ -101,22 +147,26 @@ def _decode_csrf(data):
 
 
 def _set_token(response):
+    app = current_app._get_current_object()
+    config = app.config
+    # Only ask the session interface when no domain is configured.
+    if "CSRF_COOKIE_DOMAIN" in config:
+        domain = config["CSRF_COOKIE_DOMAIN"]
+    else:
+        domain = app.session_interface.get_cookie_domain(app)
     response.set_cookie(
-        current_app.config["CSRF_COOKIE_NAME"],
+        config["CSRF_COOKIE_NAME"],
         _get_new_csrf_token(),
-        max_age=current_app.config.get(
+        max_age=config.get(
             # 1 week for cookie (but we rotate the token every day)
             "CSRF_COOKIE_MAX_AGE",
             60 * 60 * 24 * 7,
         ),
-        domain=current_app.config.get(
-            "CSRF_COOKIE_DOMAIN",
-            current_app.session_interface.get_cookie_domain(current_app),
-        ),
-        path=current_app.session_interface.get_cookie_path(current_app),
-        secure=current_app.config.get("SESSION_COOKIE_SECURE", True),
+        domain=domain,
+        path=app.session_interface.get_cookie_path(app),
+        secure=config.get("SESSION_COOKIE_SECURE", True),
         httponly=False,
-        samesite=current_app.config["CSRF_COOKIE_SAMESITE"],
+        samesite=config["CSRF_COOKIE_SAMESITE"],
     )
 
 
@@ -130,7 +180,7 @@ def _get_submitted_csrf_token():
 
 def _is_referer_secure(referer):
     return (
-        "https" in referer.scheme or not current_app.config["CSRF_FORCE_SECURE_REFERER"]
+        referer.scheme == "https" or not current_app.config["CSRF_FORCE_SECURE_REFERER"]
     )
 
 
@@ -157,7 +207,7 @@ def csrf_validate():
         if referer is None:
             return _abort400(REASON_NO_REFERER)
 
-        referer = urlparse(referer)
+        referer = urlsplit(referer)
         # Make sure we have a valid URL for Referer.
         if "" in (referer.scheme, referer.netloc):
             return _abort400(REASON_MALFORMED_REFERER)
@@ -173,9 +223,21 @@ def csrf_validate():
             reason = REASON_BAD_REFERER % referer.geturl()
             return _abort400(reason)
 
+    # Clients usually send back the cookie value itself, which has already
+    # been verified above, so there is no need to decode it a second time.
+    csrf_cookie = request.cookies[current_app.config["CSRF_COOKIE_NAME"]]
+    if hmac.compare_digest(
+        csrf_cookie.encode("utf-8"), request_csrf_token.encode("utf-8")
+    ):
+        return
+
     decoded_request_csrf_token = _decode_csrf(request_csrf_token)
 
-    if csrf_token != decoded_request_csrf_token:
+    # Compare in constant time to not leak the token through timing.
+    if not hmac.compare_digest(
+        str(csrf_token).encode("utf-8"),
+        str(decoded_request_csrf_token).encode("utf-8"),
+    ):
         return _abort400(REASON_BAD_TOKEN)
 
 
@@ -222,14 +284,15 @@ class CSRFTokenMiddleware:
         # Align with CSRF_COOKIE_MAX_AGE
         app.config.setdefault("CSRF_TOKEN_GRACE_PERIOD", 60 * 60 * 24 * 7)
 
+        methods = frozenset(app.config["CSRF_METHODS"])
+
         @app.after_request
         def csrf_send(response):
-            is_method_vulnerable = request.method in app.config["CSRF_METHODS"]
-            cookie_needs_reset = getattr(request, "csrf_cookie_needs_reset", False)
-            cookie_is_missing = (
-                current_app.config["CSRF_COOKIE_NAME"] not in request.cookies
-            )
-            if (is_method_vulnerable and cookie_is_missing) or cookie_needs_reset:
+            # Cookies are only parsed when the request method needs a token.
+            if getattr(request, "csrf_cookie_needs_reset", False) or (
+                request.method in methods
+                and app.config["CSRF_COOKIE_NAME"] not in request.cookies
+            ):
                 _set_token(response)
             return response
 
@@ -246,6 +309,7 @@ class CSRFProtectMiddleware(CSRFTokenMiddleware):
         """
         self._exempt_views = set()
         self._exempt_blueprints = set()
+        self._exempt_views_cache = {}
 
         self._before_protect_funcs = []
         if app:
@@ -257,17 +321,21 @@ class CSRFProtectMiddleware(CSRFTokenMiddleware):
         :param app: An instance of :class:`flask.Flask`.
         """
         super(CSRFProtectMiddleware, self).init_app(app)
+        methods = frozenset(app.config["CSRF_METHODS"])
 
         @app.before_request
         def csrf_protect():
             """CSRF protect method."""
-            for func in self._before_protect_funcs:
-                func()
-
-            is_method_vulnerable = request.method in app.config["CSRF_METHODS"]
-            if not is_method_vulnerable:
+            # Safe methods and unmatched URLs never need a CSRF check, so
+            # they are skipped before doing any other work.
+            is_method_vulnerable = request.method in methods
+            if not is_method_vulnerable or request.endpoint is None:
                 return
 
+            if self._before_protect_funcs:
+                for func in self._before_protect_funcs:
+                    func()
+
             if request.blueprint in self._exempt_blueprints:
                 return
 
@@ -275,17 +343,31 @@ class CSRFProtectMiddleware(CSRFTokenMiddleware):
                 return
 
             view = app.view_functions.get(request.endpoint)
-            if view:
-                dest = "{0}.{1}".format(view.__module__, view.__name__)
-                if dest in self._exempt_views:
-                    return
+            if view and self._is_view_exempt(view):
+                return
 
             return csrf_validate()
 
+    def _is_view_exempt(self, view):
+        """Check if a view function is excluded from CSRF protection.
+
+        The result is cached per view function, so the view location is only
+        computed the first time a view is requested.
+        """
+        try:
+            return self._exempt_views_cache[view]
+        except KeyError:
+            dest = "{0}.{1}".format(view.__module__, view.__name__)
+            is_exempt = dest in self._exempt_views
+            self._exempt_views_cache[view] = is_exempt
+            return is_exempt
+
     def before_csrf_protect(self, f):
         """Register functions to be invoked before checking csrf.
 
-        The function accepts nothing as parameters.
+        The function accepts nothing as parameters. It is only invoked for
+        requests using one of the ``CSRF_METHODS`` and matching a URL rule,
+        before the exempt views and blueprints are checked.
         """
         self._before_protect_funcs.append(f)
         return f
@@ -302,6 +384,7 @@ class CSRFProtectMiddleware(CSRFTokenMiddleware):
             view_location = ".".join((view.__module__, view.__name__))
 
         self._exempt_views.add(view_location)
+        self._exempt_views_cache.clear()
         return view
 
 
@@ -8,8 +8,6 @@
 
 """Decorators for testing certain assertions."""
 
-from __future__ import absolute_import, print_function
-
 from functools import wraps
 
 from flask import request
@@ -24,12 +22,14 @@ def require_content_types(*allowed_content_types):
     :raises invenio_rest.errors.InvalidContentType: It's rised if a content
         type not allowed is required.
     """
+    allowed = frozenset(allowed_content_types)
+    description = InvalidContentType.make_description(allowed_content_types)
 
     def decorator(f):
         @wraps(f)
         def inner(*args, **kwargs):
-            if request.mimetype not in allowed_content_types:
-                raise InvalidContentType(allowed_content_types)
+            if request.mimetype not in allowed:
+                raise InvalidContentType(allowed_content_types, description=description)
             return f(*args, **kwargs)
 
         return inner
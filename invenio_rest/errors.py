@@ -9,15 +9,20 @@
 
 """Exceptions used in Invenio REST module."""
 
-from __future__ import absolute_import, print_function
-
 import json
+from functools import lru_cache
 
 from flask import g
 from werkzeug.exceptions import HTTPException
 from werkzeug.http import http_date
 
 
+@lru_cache(maxsize=1024)
+def _http_date(timestamp):
+    """Format a date as an HTTP date, caching the result."""
+    return http_date(timestamp)
+
+
 class FieldError(object):
     """Represents a field level error.
 
@@ -44,6 +49,12 @@ class FieldError(object):
         return self.res
 
 
+@lru_cache(maxsize=256)
+def _dump_body(status, message):
+    """Serialize an error body only containing a status and a message."""
+    return json.dumps(dict(status=status, message=message))
+
+
 class RESTException(HTTPException):
     """HTTP Exception delivering JSON error responses."""
 
@@ -68,16 +79,22 @@ class RESTException(HTTPException):
 
     def get_body(self, environ=None, scope=None):
         """Get the request body."""
-        body = dict(
-            status=self.code,
-            message=self.get_description(environ),
+        message = self.get_description(environ)
+        errors = self.get_errors()
+        has_error_id = (
+            self.code and (self.code >= 500) and hasattr(g, "sentry_event_id")
         )
 
-        errors = self.get_errors()
+        # Bodies made of a status and a plain message are the same for every
+        # occurrence of an error, so they are only serialized once.
+        if not self.errors and not has_error_id and type(message) is str:
+            return _dump_body(self.code, message)
+
+        body = dict(status=self.code, message=message)
         if self.errors:
             body["errors"] = errors
 
-        if self.code and (self.code >= 500) and hasattr(g, "sentry_event_id"):
+        if has_error_id:
             body["error_id"] = str(g.sentry_event_id)
 
         return json.dumps(body)
@@ -94,10 +111,21 @@ class InvalidContentType(RESTException):
     """HTTP Status code."""
 
     def __init__(self, allowed_content_types=None, **kwargs):
-        """Initialize exception."""
+        """Initialize exception.
+
+        :param allowed_content_types: List of allowed content types.
+        :param description: Optional description, computed from the allowed
+            content types if not given.
+        """
         super(InvalidContentType, self).__init__(**kwargs)
         self.allowed_content_types = allowed_content_types
-        self.description = "Invalid 'Content-Type' header. Expected one of: {0}".format(
+        if kwargs.get("description") is None:
+            self.description = self.make_description(allowed_content_types)
+
+    @staticmethod
+    def make_description(allowed_content_types):
+        """Build the description listing the allowed content types."""
+        return "Invalid 'Content-Type' header. Expected one of: {0}".format(
             ", ".join(allowed_content_types)
         )
 
@@ -152,5 +180,5 @@ class SameContentException(RESTException):
         if self.etag is not None:
             response.set_etag(self.etag)
         if self.last_modified is not None:
-            response.headers["Last-Modified"] = http_date(self.last_modified)
+            response.headers["Last-Modified"] = _http_date(self.last_modified)
         return response
@@ -8,14 +8,65 @@
 
 """REST API module for Invenio."""
 
-from __future__ import absolute_import, print_function
-
+import gzip
 import warnings
 
 import pkg_resources
+from flask import current_app, request
 
 from . import config
-from .views import create_api_errorhandler
+from .views import create_api_errorhandler, create_media_type_matcher
+
+# HTTP status codes handled by the API error handlers, with their message.
+_API_ERROR_MESSAGES = (
+    (400, "Bad Request"),
+    (401, "Unauthorized"),
+    (403, "Forbidden"),
+    (404, "Not Found"),
+    (405, "Method Not Allowed"),
+    (406, "Not Acceptable"),
+    (409, "Conflict"),
+    (410, "Gone"),
+    (412, "Precondition Failed"),
+    (415, "Unsupported media type"),
+    (422, "Unprocessable Entity"),
+    (429, "Rate limit exceeded"),
+    (500, "Internal Server Error"),
+    (501, "Not Implemented"),
+    (502, "Bad Gateway"),
+    (503, "Service Unavailable"),
+    (504, "Gateway Timeout"),
+)
+
+
+def compress_response(response):
+    """Compress the response with gzip if it is worth it.
+
+    :param response: A :class:`flask.Response` instance.
+    :returns: The same response, compressed when possible.
+    """
+    config = current_app.config
+    if (
+        response.direct_passthrough
+        or response.is_streamed
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in config["REST_RESPONSE_COMPRESS_MIMETYPES"]
+    ):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    if not request.accept_encodings["gzip"]:
+        return response
+
+    data = response.get_data()
+    if len(data) < config["REST_RESPONSE_COMPRESS_MIN_SIZE"]:
+        return response
+
+    response.set_data(
+        gzip.compress(data, compresslevel=config["REST_RESPONSE_COMPRESS_LEVEL"])
+    )
+    response.headers["Content-Encoding"] = "gzip"
+    return response
 
 
 class InvenioREST(object):
@@ -38,6 +89,25 @@ class InvenioREST(object):
         """
         self.init_config(app)
 
+        # The matcher is stored per application since the extension can be
+        # initialized for several applications with a different cache size.
+        app.extensions["invenio-rest-media-type-matcher"] = create_media_type_matcher(
+            app.config["REST_NEGOTIATION_CACHE_SIZE"]
+        )
+
+        json_serializer = app.config["REST_JSON_SERIALIZER"]
+        if json_serializer == "orjson":
+            from .serializer import OrjsonProvider
+
+            app.json = OrjsonProvider(app)
+        elif json_serializer is not None:
+            raise ValueError(
+                "Unsupported JSON serializer {0!r}".format(json_serializer)
+            )
+
+        if app.config["REST_RESPONSE_COMPRESS"]:
+            app.after_request(compress_response)
+
         # Enable CORS support if desired
         if app.config["REST_ENABLE_CORS"]:
             from flask_cors import CORS
@@ -57,49 +127,10 @@ class InvenioREST(object):
                 stacklevel=2,
             )
 
-        app.errorhandler(400)(
-            create_api_errorhandler(status=400, message="Bad Request")
-        )
-        app.errorhandler(401)(
-            create_api_errorhandler(status=401, message="Unauthorized")
-        )
-        app.errorhandler(403)(create_api_errorhandler(status=403, message="Forbidden"))
-        app.errorhandler(404)(create_api_errorhandler(status=404, message="Not Found"))
-        app.errorhandler(405)(
-            create_api_errorhandler(status=405, message="Method Not Allowed")
-        )
-        app.errorhandler(406)(
-            create_api_errorhandler(status=406, message="Not Acceptable")
-        )
-        app.errorhandler(409)(create_api_errorhandler(status=409, message="Conflict"))
-        app.errorhandler(410)(create_api_errorhandler(status=410, message="Gone"))
-        app.errorhandler(412)(
-            create_api_errorhandler(status=412, message="Precondition Failed")
-        )
-        app.errorhandler(415)(
-            create_api_errorhandler(status=415, message="Unsupported media type")
-        )
-        app.errorhandler(422)(
-            create_api_errorhandler(status=422, message="Unprocessable Entity")
-        )
-        app.errorhandler(429)(
-            create_api_errorhandler(status=429, message="Rate limit exceeded")
-        )
-        app.errorhandler(500)(
-            create_api_errorhandler(status=500, message="Internal Server Error")
-        )
-        app.errorhandler(501)(
-            create_api_errorhandler(status=501, message="Not Implemented")
-        )
-        app.errorhandler(502)(
-            create_api_errorhandler(status=502, message="Bad Gateway")
-        )
-        app.errorhandler(503)(
-            create_api_errorhandler(status=503, message="Service Unavailable")
-        )
-        app.errorhandler(504)(
-            create_api_errorhandler(status=504, message="Gateway Timeout")
-        )
+        for status, message in _API_ERROR_MESSAGES:
+            app.errorhandler(status)(
+                create_api_errorhandler(status=status, message=message)
+            )
 
         app.extensions["invenio-rest"] = self
 
@@ -110,10 +141,10 @@ class InvenioREST(object):
 
         :param app: An instance of :class:`flask.Flask`.
         """
-        config_apps = [
+        config_apps = (
             "REST_",
             "CORS_",
-        ]
+        )
         for k in dir(config):
-            if any([k.startswith(prefix) for prefix in config_apps]):
+            if k.startswith(config_apps):
                 app.config.setdefault(k, getattr(config, k))
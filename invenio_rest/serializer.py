@@ -10,46 +10,50 @@
 
 import warnings
 
+from flask.json.provider import DefaultJSONProvider
 from marshmallow import Schema
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+_data_deprecation_warned = False
+
+
+def _warn_data_deprecated():
+    """Warn about the deprecated ``data`` attribute, once per process."""
+    global _data_deprecation_warned
+    if _data_deprecation_warned:
+        return
+    _data_deprecation_warned = True
+    warnings.warn(
+        "Schema().dump().data and Schema().dump().errors "
+        "as well as Schema().load().data and Schema().loads().data"
+        "attributes are deprecated in marshmallow v3.x.",
+        category=PendingDeprecationWarning,
+        stacklevel=3,
+    )
+
 
 class MarshmalDict(dict):
     """Wrapping class for result of type dictionary."""
 
-    def __init__(self, result):
-        """Initialize MarshmalDict."""
-        self.update(result)
-
     @property
     def data(self):
         """Substituting data property for backwards compatibility."""
-        warnings.warn(
-            "Schema().dump().data and Schema().dump().errors "
-            "as well as Schema().load().data and Schema().loads().data"
-            "attributes are deprecated in marshmallow v3.x.",
-            category=PendingDeprecationWarning,
-            stacklevel=2,
-        )
+        _warn_data_deprecated()
         return self
 
 
 class MarshmalList(list):
     """Wrapping class for result of type list."""
 
-    def __init__(self, result):
-        """Initialize MarshmalList."""
-        self.extend(result)
-
     @property
     def data(self):
         """Substituting data property for backwards compatibility."""
-        warnings.warn(
-            "Schema().dump().data and Schema().dump().errors "
-            "as well as Schema().load().data and Schema().loads().data"
-            "attributes are deprecated in marshmallow v3.x.",
-            category=PendingDeprecationWarning,
-            stacklevel=2,
-        )
+        _warn_data_deprecated()
         return self
 
 
@@ -86,3 +90,64 @@ class BaseSchema(Schema):
         """Wrap loads result for backward compatibility."""
         result = super(BaseSchema, self).loads(obj, *args, **kwargs)
         return result_wrapper(result)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider using orjson.
+
+    It keeps the behaviour of Flask's default provider (sorted keys, dates
+    serialized in HTTP format, indentation in debug mode) but delegates the
+    encoding and decoding to `orjson <https://github.com/ijl/orjson>`_.
+    """
+
+    def __init__(self, app):
+        """Initialize the provider."""
+        if orjson is None:
+            raise RuntimeError("orjson must be installed to use OrjsonProvider.")
+        super(OrjsonProvider, self).__init__(app)
+
+    def _dumps(self, obj, default=None, sort_keys=None, indent=None, **kwargs):
+        """Serialize data as JSON to bytes."""
+        if kwargs:
+            _raise_unsupported(kwargs)
+        if indent not in (None, 2):
+            raise ValueError("orjson only supports an indentation of 2 spaces.")
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys if sort_keys is None else sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=default or self.default, option=option)
+
+    def dumps(self, obj, **kwargs):
+        """Serialize data as JSON to a string.
+
+        :raises TypeError: If options other than ``default``, ``sort_keys``
+            and ``indent`` are given.
+        :raises ValueError: If ``indent`` is not ``None`` or ``2``.
+        """
+        return self._dumps(obj, **kwargs).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        """Deserialize data as JSON from a string or bytes.
+
+        :raises TypeError: If keyword arguments are given, as orjson does not
+            support any of the options of :func:`json.loads`.
+        """
+        if kwargs:
+            _raise_unsupported(kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """Serialize the given arguments as a JSON response."""
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = self.compact is False or (self.compact is None and self._app.debug)
+        indent = 2 if pretty else None
+        return self._app.response_class(
+            self._dumps(obj, indent=indent) + b"\n", mimetype=self.mimetype
+        )
+
+
+def _raise_unsupported(kwargs):
+    """Raise an error for JSON options which orjson does not support."""
+    raise TypeError("Unsupported arguments for orjson: {0}".format(", ".join(kwargs)))
@@ -9,14 +9,16 @@
 
 """REST API module for Invenio."""
 
-from __future__ import absolute_import, print_function
-
 from datetime import timezone
+from functools import lru_cache
 
-from flask import Response, abort, current_app, g, jsonify, make_response, request
+from flask import Response, abort, current_app, g, request
 from flask.views import MethodView
+from werkzeug.datastructures import MIMEAccept
 from werkzeug.exceptions import HTTPException
+from werkzeug.http import parse_accept_header
 
+from . import config
 from .errors import RESTException, SameContentException
 
 try:
@@ -25,6 +27,13 @@ except ImportError:
     sentry_sdk = None
 
 
+def _make_json_response(data, status):
+    """Create a JSON response with the application's JSON provider."""
+    response = current_app.json.response(data)
+    response.status_code = status
+    return response
+
+
 def create_api_errorhandler(**kwargs):
     r"""Create an API error handler.
 
@@ -42,17 +51,83 @@ def create_api_errorhandler(**kwargs):
     def api_errorhandler(e):
         if isinstance(e, RESTException):
             return e.get_response()
-        elif isinstance(e, HTTPException) and e.description:
-            kwargs["message"] = e.description
+        message = kwargs.get("message")
+        if isinstance(e, HTTPException) and e.description:
+            message = e.description
+        error_id = None
         if kwargs.get("status", 400) >= 500 and sentry_sdk is not None:
             sentry_event_id = sentry_sdk.last_event_id()
             if sentry_event_id:
-                kwargs["error_id"] = str(sentry_event_id)
-        return make_response(jsonify(kwargs), kwargs["status"])
+                error_id = str(sentry_event_id)
+        # Never modify ``kwargs``, they are shared by all the requests.
+        data = dict(kwargs)
+        if message is not None:
+            data["message"] = message
+        if error_id is not None:
+            data["error_id"] = error_id
+        return _make_json_response(data, data["status"])
 
     return api_errorhandler
 
 
+def _match_media_type(accept, media_types, default_media_type):
+    """Match the best media type for a raw ``Accept`` header.
+
+    Clients send a small set of distinct ``Accept`` headers, so the result
+    only depends on hashable strings and can be cached to avoid parsing the
+    header on every request (see :func:`create_media_type_matcher`).
+
+    :param accept: The raw value of the ``Accept`` header.
+    :param media_types: Tuple of media types supported by the serializers.
+    :param default_media_type: The default media type.
+    :returns: The best matching media type or ``None``.
+    """
+    accept_mimetypes = parse_accept_header(accept, MIMEAccept)
+    # Bail out fast if no accept headers were given.
+    if len(accept_mimetypes) == 0:
+        return default_media_type
+
+    # Determine best match based on quality. A ``*/*`` media type matches
+    # any client media type and, on a tie, the last one in order wins.
+    positions = {s: i for i, s in enumerate(media_types)}
+    wildcard_position = positions.get("*/*", -1)
+    best_quality = -1
+    best = None
+    has_wildcard = False
+    for client_accept, quality in accept_mimetypes:
+        if quality <= best_quality:
+            continue
+        if client_accept == "*/*":
+            has_wildcard = True
+        if quality > 0:
+            position = max(positions.get(client_accept, -1), wildcard_position)
+            if position >= 0:
+                best_quality = quality
+                best = media_types[position]
+
+    # If no match found, but wildcard exists, them use default media
+    # type.
+    if best is None and has_wildcard:
+        best = default_media_type
+    return best
+
+
+def create_media_type_matcher(cache_size):
+    """Create a media type matcher caching up to ``cache_size`` results.
+
+    :param cache_size: Maximum number of cached ``Accept`` headers. Caching
+        is disabled if it is ``0`` or ``None``.
+    """
+    if not cache_size:
+        return _match_media_type
+    return lru_cache(maxsize=cache_size)(_match_media_type)
+
+
+_default_media_type_matcher = create_media_type_matcher(
+    config.REST_NEGOTIATION_CACHE_SIZE
+)
+
+
 class ContentNegotiatedMethodView(MethodView):
     """MethodView with content negotiation.
 
@@ -174,29 +249,20 @@ class ContentNegotiatedMethodView(MethodView):
 
     def _match_serializers_by_accept_headers(self, serializers, default_media_type):
         """Match serializer by `Accept` headers."""
-        # Bail out fast if no accept headers were given.
-        if len(request.accept_mimetypes) == 0:
+        accept = request.headers.get("Accept", "")
+        # Fast path for the most common headers, which select the default
+        # media type without any parsing.
+        if (
+            accept in ("", "*/*", default_media_type)
+            and default_media_type in serializers
+            and "*/*" not in serializers
+        ):
             return serializers[default_media_type]
 
-        # Determine best match based on quality.
-        best_quality = -1
-        best = None
-        has_wildcard = False
-        for client_accept, quality in request.accept_mimetypes:
-            if quality <= best_quality:
-                continue
-            if client_accept == "*/*":
-                has_wildcard = True
-            for s in serializers:
-                if s in ["*/*", client_accept] and quality > 0:
-                    best_quality = quality
-                    best = s
-
-        # If no match found, but wildcard exists, them use default media
-        # type.
-        if best is None and has_wildcard:
-            best = default_media_type
-
+        match_media_type = current_app.extensions.get(
+            "invenio-rest-media-type-matcher", _default_media_type_matcher
+        )
+        best = match_media_type(accept, tuple(serializers), default_media_type)
         if best is not None:
             return serializers[best]
         return None
@@ -283,29 +349,28 @@ class ContentNegotiatedMethodView(MethodView):
             the request is GET or HEAD and the If-None-Match condition is not
             met.
         """
+        # Most requests are not conditional, skip parsing the headers then.
+        environ = request.environ
+        if "HTTP_IF_MATCH" not in environ and "HTTP_IF_NONE_MATCH" not in environ:
+            return
+
         # bool(:py:class:`werkzeug.datastructures.ETags`) is not consistent
         # in Python 3. bool(Etags()) == True even though it is empty.
-        if (
-            len(request.if_match.as_set(include_weak=weak)) > 0
-            or request.if_match.star_tag
-        ):
+        if_match = request.if_match
+        if if_match.star_tag or if_match.as_set(include_weak=weak):
             contains_etag = (
-                request.if_match.contains_weak(etag)
-                if weak
-                else request.if_match.contains(etag)
+                if_match.contains_weak(etag) if weak else if_match.contains(etag)
             )
-            if not contains_etag and "*" not in request.if_match:
+            if not contains_etag and "*" not in if_match:
                 abort(412)
-        if (
-            len(request.if_none_match.as_set(include_weak=weak)) > 0
-            or request.if_none_match.star_tag
-        ):
+        if_none_match = request.if_none_match
+        if if_none_match.star_tag or if_none_match.as_set(include_weak=weak):
             contains_etag = (
-                request.if_none_match.contains_weak(etag)
+                if_none_match.contains_weak(etag)
                 if weak
-                else request.if_none_match.contains(etag)
+                else if_none_match.contains(etag)
             )
-            if contains_etag or "*" in request.if_none_match:
+            if contains_etag or "*" in if_none_match:
                 if request.method in ("GET", "HEAD"):
                     raise SameContentException(etag)
                 else:
@@ -13,6 +13,7 @@
 from __future__ import absolute_import, print_function
 
 import json
+import string
 
 from flask import Blueprint, Flask, request
 
@@ -23,7 +24,9 @@ from invenio_rest.csrf import (
     REASON_MALFORMED_REFERER,
     REASON_NO_REFERER,
     CSRFProtectMiddleware,
+    _get_csrf_serializer,
     _get_new_csrf_token,
+    _get_random_string,
 )
 
 
@@ -113,6 +116,26 @@ def test_csrf_before_csrf_protect(csrf_app, csrf):
     assert csrf._before_protect_funcs == [before_protect, before_protect]
 
 
+def test_csrf_before_csrf_protect_safe_methods(csrf_app, csrf):
+    """Test that safe methods skip the CSRF protection entirely."""
+    calls = []
+    csrf.before_csrf_protect(lambda: calls.append(request.method))
+
+    with csrf_app.test_client() as client:
+        client.get("/ping")
+        assert calls == []
+        client.post(
+            "/csrf-protected",
+            data=json.dumps(dict(foo="bar")),
+            content_type="application/json",
+        )
+        assert calls == ["POST"]
+        # Unknown URLs are not checked either.
+        res = client.post("/unknown")
+        assert res.status_code == 404
+        assert calls == ["POST"]
+
+
 def test_csrf_exempt(csrf_app, csrf):
     """Test before CSRF protect decorator."""
 
@@ -127,6 +150,31 @@ def test_csrf_exempt(csrf_app, csrf):
         assert res.status_code == 200
 
 
+def test_csrf_exempt_after_request(csrf_app, csrf):
+    """Test exempting a view which has already been requested."""
+    with csrf_app.test_client() as client:
+        # First request to set the cookie
+        client.post(
+            "/csrf-protected",
+            data=json.dumps(dict(foo="bar")),
+            content_type="application/json",
+        )
+        res = client.post(
+            "/csrf-protected",
+            data=json.dumps(dict(foo="bar")),
+            content_type="application/json",
+        )
+        assert res.status_code == 400
+
+        csrf.exempt("conftest.csrf_test")
+        res = client.post(
+            "/csrf-protected",
+            data=json.dumps(dict(foo="bar")),
+            content_type="application/json",
+        )
+        assert res.status_code == 200
+
+
 def test_csrf_exempt_dec(csrf_app, csrf):
     # Test `exempt` as a decorator on a view
     @csrf_app.route("/another-csrf-protect", methods=["POST"])
@@ -204,6 +252,66 @@ def test_skip_csrf_check(csrf_app, csrf):
         assert res.status_code == 200
 
 
+def test_get_random_string():
+    """Test the generation of random strings."""
+    for allowed_chars in ["ab", "abc", string.ascii_letters + string.digits]:
+        value = _get_random_string(1000, allowed_chars)
+        assert len(value) == 1000
+        assert set(value) == set(allowed_chars)
+    assert _get_random_string(0, "abc") == ""
+    assert len(_get_random_string(8, "x" * 300)) == 8
+    assert set(_get_random_string(100, "\u00e9\u00e8")) == {"\u00e9", "\u00e8"}
+
+
+def test_csrf_cookie_name_changed_after_init(csrf_app, csrf):
+    """Test that the CSRF cookie name is read on every request."""
+    csrf_app.config["CSRF_COOKIE_NAME"] = "othername"
+    with csrf_app.test_client() as client:
+        res = client.post("/csrf-protected")
+        assert "othername" in res.headers["Set-Cookie"]
+        token = client.get_cookie("othername").value
+
+        # The cookie is set, so no new token is issued.
+        res = client.post(
+            "/csrf-protected",
+            headers={csrf_app.config["CSRF_HEADER"]: token},
+        )
+        assert res.status_code == 200
+        assert "Set-Cookie" not in res.headers
+
+
+def test_csrf_serializer_cache(csrf_app, csrf):
+    """Test that the CSRF serializer is reused while the config is unchanged."""
+    with csrf_app.app_context():
+        serializer = _get_csrf_serializer()
+        assert _get_csrf_serializer() is serializer
+        assert _get_csrf_serializer(expires_in=10) is not serializer
+
+        csrf_app.config["CSRF_SECRET"] = "another-secret"
+        assert _get_csrf_serializer() is not serializer
+
+
+def test_csrf_secret_rotation(csrf_app, csrf):
+    """Test CSRF secrets given as a list for key rotation."""
+    csrf_app.config["CSRF_SECRET"] = "old-secret"
+    with csrf_app.test_request_context():
+        old_token = _get_new_csrf_token()
+
+    csrf_app.config["CSRF_SECRET"] = ["new-secret", "old-secret"]
+    with csrf_app.test_client() as client:
+        CSRF_COOKIE_NAME = csrf_app.config["CSRF_COOKIE_NAME"]
+        CSRF_HEADER_NAME = csrf_app.config["CSRF_HEADER"]
+        for token in [old_token, _get_new_csrf_token()]:
+            client.set_cookie(CSRF_COOKIE_NAME, token, domain="localhost")
+            res = client.post(
+                "/csrf-protected",
+                data=json.dumps(dict(foo="bar")),
+                content_type="application/json",
+                headers={CSRF_HEADER_NAME: token},
+            )
+            assert res.status_code == 200
+
+
 def test_csrf_not_signed_correctly(csrf_app, csrf):
     """Test CSRF malicious attempt with passing malicious cookie and header."""
     from invenio_base.jws import TimedJSONWebSignatureSerializer
@@ -285,6 +393,23 @@ def test_csrf_token_rotation(csrf_app, csrf):
         assert res.status_code == 400
 
 
+def test_csrf_token_mismatch(csrf_app, csrf):
+    """Test CSRF header signed correctly but not matching the cookie."""
+    with csrf_app.test_client() as client:
+        CSRF_COOKIE_NAME = csrf_app.config["CSRF_COOKIE_NAME"]
+        CSRF_HEADER_NAME = csrf_app.config["CSRF_HEADER"]
+        client.set_cookie(CSRF_COOKIE_NAME, _get_new_csrf_token(), domain="localhost")
+
+        res = client.post(
+            "/csrf-protected",
+            data=json.dumps(dict(foo="bar")),
+            content_type="application/json",
+            headers={CSRF_HEADER_NAME: _get_new_csrf_token()},
+        )
+        assert res.json["message"] == REASON_BAD_TOKEN
+        assert res.status_code == 400
+
+
 def test_csrf_no_referer(csrf_app, csrf):
     """Test CSRF no referrer in a secure request."""
     with csrf_app.test_client() as client:
@@ -352,18 +477,19 @@ def test_csrf_insecure_referer(csrf_app, csrf):
 
         cookie = client.get_cookie(CSRF_COOKIE_NAME)
 
-        res = client.post(
-            "/csrf-protected",
-            base_url="https://localhost",
-            data=json.dumps(dict(foo="bar")),
-            content_type="application/json",
-            headers={
-                CSRF_HEADER_NAME: cookie.value,
-                "Referer": "http://insecure-referer",
-            },
-        )
-        assert res.json["message"] == REASON_INSECURE_REFERER
-        assert res.status_code == 400
+        for referer in ["http://insecure-referer", "httpsx://insecure-referer"]:
+            res = client.post(
+                "/csrf-protected",
+                base_url="https://localhost",
+                data=json.dumps(dict(foo="bar")),
+                content_type="application/json",
+                headers={
+                    CSRF_HEADER_NAME: cookie.value,
+                    "Referer": referer,
+                },
+            )
+            assert res.json["message"] == REASON_INSECURE_REFERER
+            assert res.status_code == 400
 
 
 def test_csrf_bad_referer(csrf_app, csrf):
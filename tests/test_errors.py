@@ -57,3 +57,33 @@ def test_errors(app):
         assert data["status"] == 400
         assert data["message"] == "Validation error."
         assert data["errors"] == [dict(field="myfield", message="mymessage", code=10)]
+
+
+def test_errors_body_cache(app):
+    """Test that simple error bodies are only serialized once."""
+    from invenio_rest.errors import _dump_body
+
+    _dump_body.cache_clear()
+    for _ in range(3):
+        body = InvalidContentType(allowed_content_types=["application/json"]).get_body()
+        assert json.loads(body) == {
+            "status": 415,
+            "message": "Invalid 'Content-Type' header. Expected one of: "
+            "application/json",
+        }
+    assert _dump_body.cache_info().hits == 2
+
+    body = RESTValidationError(errors=[FieldError("f", "m")]).get_body()
+    assert json.loads(body)["errors"] == [dict(field="f", message="m")]
+    assert _dump_body.cache_info().misses == 1
+
+
+def test_invalid_content_type_description():
+    """Test the description of invalid content type errors."""
+    error = InvalidContentType(allowed_content_types=["a/b", "c/d"])
+    assert (
+        error.description == "Invalid 'Content-Type' header. Expected one of: a/b, c/d"
+    )
+    error = InvalidContentType(allowed_content_types=["a/b"], description="custom")
+    assert error.description == "custom"
+    assert error.allowed_content_types == ["a/b"]
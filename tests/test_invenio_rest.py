@@ -11,6 +11,7 @@
 
 from __future__ import absolute_import, print_function
 
+import gzip
 import json
 from datetime import datetime
 from urllib.parse import urlencode
@@ -19,6 +20,7 @@ import pkg_resources
 import pytest
 from flask import Flask, abort, make_response, request
 from flask.json import jsonify
+from werkzeug.exceptions import NotFound
 from werkzeug.http import quote_etag, unquote_etag
 
 from invenio_rest import ContentNegotiatedMethodView, InvenioREST
@@ -99,11 +101,57 @@ def test_error_handlers(app):
                     # https://github.com/pallets/werkzeug/issues/1231
                     continue
                 if verb != client.head:
+                    assert res.content_type == "application/json"
+                    assert res.content_length == len(res.get_data())
                     data = json.loads(res.get_data(as_text=True))
                     assert data["status"] == s
                     assert data["message"]
 
 
+def test_error_handlers_json_provider(app):
+    """Error bodies are encoded with the application's JSON provider."""
+    InvenioREST(app)
+
+    class LazyDescription(object):
+        def __html__(self):
+            return "Lazy description"
+
+    class LazyNotFound(NotFound):
+        description = LazyDescription()
+
+    @app.route("/lazy")
+    def lazy():
+        raise LazyNotFound()
+
+    with app.test_client() as client:
+        res = client.get("/lazy")
+        assert res.status_code == 404
+        assert res.content_type == "application/json"
+        assert res.json == {"status": 404, "message": "Lazy description"}
+        # Keys are sorted by Flask's default provider.
+        body = res.get_data(as_text=True)
+        assert list(json.loads(body)) == ["message", "status"]
+        assert body.endswith("\n")
+
+
+def test_error_handlers_custom_description(app):
+    """Custom error descriptions do not leak into later responses."""
+    InvenioREST(app)
+
+    @app.route("/custom")
+    def custom():
+        abort(404, "Custom description")
+
+    with app.test_client() as client:
+        default = client.get("/not-found").json
+        assert client.get("/custom").json == {
+            "status": 404,
+            "message": "Custom description",
+        }
+        assert client.get("/not-found").json == default
+        assert default["message"] != "Custom description"
+
+
 def test_custom_httpexception(app):
     """Test custom RESTException."""
     InvenioREST(app)
@@ -146,6 +194,41 @@ def test_cors(app):
         )
 
 
+def test_response_compress(app):
+    """Test gzip compression of the responses."""
+    app.config["REST_RESPONSE_COMPRESS"] = True
+    InvenioREST(app)
+
+    @app.route("/large")
+    def large():
+        return jsonify(data="x" * 1000)
+
+    @app.route("/small")
+    def small():
+        return jsonify(data="x")
+
+    @app.route("/text")
+    def text():
+        return "x" * 1000
+
+    gzip_headers = [("Accept-Encoding", "gzip, deflate")]
+    with app.test_client() as client:
+        res = client.get("/large", headers=gzip_headers)
+        assert res.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in res.vary
+        assert res.content_length == len(res.get_data())
+        assert json.loads(gzip.decompress(res.get_data())) == {"data": "x" * 1000}
+
+        res = client.get("/large")
+        assert "Content-Encoding" not in res.headers
+        assert "Accept-Encoding" in res.vary
+        assert res.json == {"data": "x" * 1000}
+
+        for url in ["/small", "/text"]:
+            res = client.get(url, headers=gzip_headers)
+            assert "Content-Encoding" not in res.headers
+
+
 def _obj_to_json_serializer(data, code=200, headers=None):
     if data:
         res = jsonify(data)
@@ -478,6 +561,13 @@ def test_get_method_serializers(app):
 
     assert v.get_method_serializers("DELETE")[0] == v.method_serializers["DELETE"]
 
+    # Serializers set after the view creation are used too
+    v.method_serializers = dict(GET={"text/csv": "csv-get"})
+    v.default_method_media_type = dict(GET="text/csv")
+    assert v.get_method_serializers("GET") == ({"text/csv": "csv-get"}, "text/csv")
+    assert v.get_method_serializers("HEAD") == ({"text/csv": "csv-get"}, "text/csv")
+    assert v.get_method_serializers("POST")[0] == v.serializers
+
 
 def test_match_serializers_headers(app):
     """Test match serializers headers."""
@@ -556,6 +646,60 @@ def test_match_serializers_headers(app):
         _test_march_serializers(app, v, params, method, accept, expected_serializer)
 
 
+def test_match_serializers_headers_cache(app):
+    """Test that the negotiated media type is cached per Accept header."""
+    from invenio_rest.views import _default_media_type_matcher as matcher
+
+    v = ContentNegotiatedMethodView(
+        serializers={
+            "application/json": "json",
+            "application/marcxml+xml": "xml",
+        },
+        default_media_type="application/json",
+    )
+    matcher.cache_clear()
+    params = dict(headers=[("Accept", "application/marcxml+xml")])
+    for _ in range(3):
+        _test_march_serializers(app, v, params, "GET", None, "xml")
+    info = matcher.cache_info()
+    assert info.misses == 1
+    assert info.hits == 2
+
+    # The default media type is selected without calling the matcher.
+    for accept in [None, "*/*", "application/json"]:
+        params = dict(headers=[("Accept", accept)]) if accept else {}
+        _test_march_serializers(app, v, params, "GET", None, "json")
+    assert matcher.cache_info() == info
+
+
+def test_negotiation_cache_size(app):
+    """Test the configuration of the content negotiation cache."""
+    app.config["REST_NEGOTIATION_CACHE_SIZE"] = 2
+    ext = InvenioREST(app)
+    matcher = app.extensions["invenio-rest-media-type-matcher"]
+    assert matcher.cache_info().maxsize == 2
+
+    v = ContentNegotiatedMethodView(
+        serializers={"application/json": "json"},
+    )
+    params = dict(headers=[("Accept", "text/plain, application/json")])
+    for _ in range(2):
+        _test_march_serializers(app, v, params, "GET", None, "json")
+    assert matcher.cache_info().hits == 1
+
+    # Initializing the extension for another application does not change
+    # the matcher of the first one.
+    other_app = Flask("other")
+    other_app.config["REST_NEGOTIATION_CACHE_SIZE"] = 0
+    ext.init_app(other_app)
+    assert app.extensions["invenio-rest-media-type-matcher"] is matcher
+    other_matcher = other_app.extensions["invenio-rest-media-type-matcher"]
+    assert not hasattr(other_matcher, "cache_info")
+    _test_march_serializers(other_app, v, params, "GET", None, "json")
+    _test_march_serializers(app, v, params, "GET", None, "json")
+    assert matcher.cache_info().hits == 2
+
+
 def test_match_serializers_query_arg(app):
     """Test match serializers query argument."""
     v = ContentNegotiatedMethodView(
@@ -10,11 +10,16 @@
 
 from __future__ import absolute_import, print_function
 
+import warnings
 from collections import namedtuple
+from datetime import datetime
 
+import pytest
+from flask import Flask, jsonify
 from marshmallow import fields
 
-from invenio_rest.serializer import BaseSchema, result_wrapper
+from invenio_rest import InvenioREST
+from invenio_rest.serializer import BaseSchema, OrjsonProvider, result_wrapper
 
 
 def test_serialize_pretty(app):
@@ -47,3 +52,51 @@ def test_marshmallow_compatibility():
     assert wrapped == tuple_result
     assert isinstance(wrapped, tuple)
     assert tuple_result.data == dict_result
+
+
+def test_data_deprecation_warning(monkeypatch):
+    """Test that the data attribute deprecation is only reported once."""
+    from invenio_rest import serializer
+
+    monkeypatch.setattr(serializer, "_data_deprecation_warned", False)
+    with pytest.warns(PendingDeprecationWarning):
+        assert result_wrapper({"test": 1}).data == {"test": 1}
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert result_wrapper([1]).data == [1]
+
+
+def test_orjson_provider():
+    """Test the orjson JSON provider."""
+    pytest.importorskip("orjson")
+    app = Flask("testapp")
+    app.config["REST_JSON_SERIALIZER"] = "orjson"
+    InvenioREST(app)
+    assert isinstance(app.json, OrjsonProvider)
+
+    data = {"b": 1, "a": datetime(2019, 1, 2, 3, 4, 5), 1: "int key"}
+    with app.app_context():
+        res = jsonify(data)
+        assert res.content_type == "application/json"
+        assert app.json.loads(res.get_data()) == {
+            "1": "int key",
+            "a": "Wed, 02 Jan 2019 03:04:05 GMT",
+            "b": 1,
+        }
+        assert app.json.dumps({"b": 1, "a": 2}) == '{"a":2,"b":1}'
+        assert res.get_data(as_text=True).endswith("}\n")
+        assert app.json.dumps({"a": 1}, indent=2) == '{\n  "a": 1\n}'
+        with pytest.raises(TypeError):
+            app.json.loads("{}", object_hook=dict)
+        with pytest.raises(TypeError):
+            app.json.dumps({}, ensure_ascii=False)
+        with pytest.raises(ValueError):
+            app.json.dumps({}, indent=4)
+
+
+def test_json_serializer_invalid():
+    """Test an unsupported JSON serializer."""
+    app = Flask("testapp")
+    app.config["REST_JSON_SERIALIZER"] = "invalid"
+    with pytest.raises(ValueError):
+        InvenioREST(app)